@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+# modules that must not be imported until they are used
+HEAVY_MODULES = ["selenium", "webdriver_manager", "pandas", "openai", "google.genai"]
+# max seconds to import the module in a fresh interpreter
+MAX_IMPORT_TIME = {
+    "table_class": 0.5,
+    "evaluate": 0.5,
+    "scraper": 0.5,
+    "generate": 0.5,
+}
+
+def measure_import(module: str) -> tuple[float, list[str]]:
+    """import the module in a fresh interpreter,
+    returns the import time in seconds and the heavy modules that got imported
+    """
+    code = ("import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {module}\n"
+            "elapsed = time.perf_counter() - start\n"
+            f"print(elapsed, ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules), sep='|')")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+    
+    # the module may print on import, the measurement is the last line
+    seconds, loaded = result.stdout.strip().splitlines()[-1].split("|")
+    return float(seconds), [m for m in loaded.split(",") if m]
+
+def main() -> int:
+    failed = False
+    for module, max_time in MAX_IMPORT_TIME.items():
+        try:
+            seconds, loaded = measure_import(module)
+        except ImportError as e:
+            print(f"FAIL import {module}: {e}")
+            failed = True
+            continue
+        
+        ok = seconds <= max_time and not loaded
+        failed = failed or not ok
+        print(f"{'ok  ' if ok else 'FAIL'} import {module}: {seconds*1000:.1f} ms"
+              + (f", eagerly imported: {', '.join(loaded)}" if loaded else ""))
+        
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
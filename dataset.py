@@ -0,0 +1,212 @@
+import json
+import os
+import re
+from os import path, makedirs, listdir
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:     # Windows, appends to a shard are then only safe from a single process
+    fcntl = None
+
+SHARD_SIZE = 500
+
+class ShardedDataset:
+    """Directory of game records split into shard files of at most `shard_size` records.
+    Shard `n` is the JSON lines file `shard_0000n.jsonl` with the index file `shard_0000n.idx`,
+    where each line is `<game_id>\\t<byte offset of the record>`.
+    Reading a record by game_id is a seek into its shard, and processes that append to different shards
+    do not write to the same files. Appends take an exclusive lock on the shard and reading the index takes a shared one,
+    so processes sharing a shard can not corrupt or half read its index. Appending a game_id that exists replaces the record,
+    the old line stays in the shard and counts towards its size.
+    """
+
+    def __init__(self, root: str, shard_size: int = SHARD_SIZE):
+        self.root = root
+        self.shard_size = shard_size
+        makedirs(root, exist_ok=True)
+        self.load_index()
+
+    def load_index(self):
+        """read the index files, call again to see records appended by other processes"""
+        self.index: dict[str, tuple[int, int]] = {}    # game_id -> (shard, offset)
+        self.shard_counts: dict[int, int] = {}
+
+        for file_name in sorted(listdir(self.root)):
+            matched = re.fullmatch(r"shard_(\d+)\.idx", file_name)
+            if not matched:
+                continue
+            shard = int(matched.group(1))
+            for game_id, offset in self.read_index(shard):
+                self.index[game_id] = (shard, offset)
+                self.shard_counts[shard] = self.shard_counts.get(shard, 0) + 1
+                
+    def read_index(self, shard: int) -> list[tuple[str, int]]:
+        """(game_id, offset) lines of the index of a shard, read under a shared lock on the shard
+        so no append is half written. Lines cut short by a writer that was killed are skipped.
+        """
+        with open(self.shard_path(shard, "jsonl"), "ab") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_SH)
+            try:
+                with open(self.shard_path(shard, "idx"), "r") as file:
+                    lines = file.readlines()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        
+        entries = []
+        for line in lines:
+            matched = re.fullmatch(r"([^\t\n]+)\t(\d+)\n", line)
+            if matched is None:
+                print(f"skipped incomplete index line of shard {shard}: {line!r}")
+                continue
+            entries.append((matched.group(1), int(matched.group(2))))
+        return entries
+
+    def shard_path(self, shard: int, ext: str) -> str:
+        return path.join(self.root, f"shard_{shard:05d}.{ext}")
+
+    def shard_of(self, game_id: str) -> int:
+        return self.index[game_id][0]
+
+    def game_ids(self) -> list[str]:
+        """game ids ordered by shard and position in the shard"""
+        return sorted(self.index, key=self.index.__getitem__)
+
+    def get(self, game_id: str) -> dict:
+        """
+        Raises:
+            KeyError: if there is no record of the game
+        """
+        shard, offset = self.index[game_id]
+        with open(self.shard_path(shard, "jsonl"), "rb") as file:
+            file.seek(offset)
+            return json.loads(file.readline())
+
+    def append(self, record: dict, shard: int | None = None):
+        """append the record to the given shard, by default to the shard of the record it replaces,
+        or the last shard or a new one if it is full
+        """
+        if shard is None and record["game_id"] in self.index:
+            shard = self.shard_of(record["game_id"])
+        elif shard is None:
+            shard = max(self.shard_counts, default=0)
+            if self.shard_counts.get(shard, 0) >= self.shard_size:
+                shard += 1
+
+        # the record is written before its index line, so the index never points past the end of a shard,
+        # and both are written under the lock so the offset is the end of the shard at the time of the write
+        with open(self.shard_path(shard, "jsonl"), "ab") as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                # a writer killed mid-line leaves a line without its newline, remove it before appending after it
+                truncate_partial_line(self.shard_path(shard, "jsonl"))
+                truncate_partial_line(self.shard_path(shard, "idx"))
+                offset = os.fstat(file.fileno()).st_size
+                file.write(json.dumps(record).encode() + b"\n")
+                file.flush()
+                with open(self.shard_path(shard, "idx"), "a") as index_file:
+                    index_file.write(f"{record['game_id']}\t{offset}\n")
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(file, fcntl.LOCK_UN)
+
+        self.index[record["game_id"]] = (shard, offset)
+        self.shard_counts[shard] = self.shard_counts.get(shard, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.index
+
+    def __iter__(self) -> Iterator[dict]:
+        for game_id in self.game_ids():
+            yield self.get(game_id)
+
+def truncate_partial_line(file_path: str, chunk_size: int = 4096):
+    """remove the last line of the file if it does not end with a newline, only reads the end of the file"""
+    try:
+        file = open(file_path, "rb")
+    except FileNotFoundError:
+        return
+    with file:
+        end = file.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        file.seek(end - 1)
+        if file.read(1) == b"\n":
+            return
+        
+        # look backwards for the newline ending the last complete line
+        pos = end
+        while pos > 0:
+            start = max(0, pos - chunk_size)
+            file.seek(start)
+            newline = file.read(pos - start).rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+    os.truncate(file_path, pos)
+
+class JsonDataset:
+    """Read-only dataset of a single JSON array file, with the same interface as ShardedDataset.
+    Iterating yields every record as stored, including records without a game_id and duplicates;
+    the game_id lookup used by `get` is only built when needed, and the last duplicate wins.
+    """
+
+    def __init__(self, filepath: str):
+        with open(filepath, "r") as file:
+            self.records: list[dict] = json.load(file)
+        self._by_id: dict[str, dict] | None = None
+
+    @property
+    def by_id(self) -> dict[str, dict]:
+        if self._by_id is None:
+            self._by_id = {record["game_id"]: record for record in self.records if "game_id" in record}
+        return self._by_id
+
+    def game_ids(self) -> list[str]:
+        return list(self.by_id)
+
+    def get(self, game_id: str) -> dict:
+        return self.by_id[game_id]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.by_id
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.records)
+
+def parse_shard_range(text: str) -> list[int] | None:
+    """shard numbers of "3" or "3-5", None for an empty string meaning all shards
+
+    Raises:
+        ValueError: if text is not a shard number or range
+    """
+    text = text.strip()
+    if text == "":
+        return None
+    matched = re.fullmatch(r"(\d+)\s*(?:-\s*(\d+))?", text)
+    if matched is None:
+        raise ValueError(f"invalid shard range: {text}")
+    first = int(matched.group(1))
+    last = int(matched.group(2) or first)
+    return list(range(first, last + 1))
+
+def is_sharded(dataset_path: str) -> bool:
+    """sharded datasets are directories, anything ending with .json is a JSON array file"""
+    return not dataset_path.endswith(".json")
+
+def open_dataset(dataset_path: str) -> ShardedDataset | JsonDataset:
+    if is_sharded(dataset_path):
+        if not path.isdir(dataset_path):
+            raise FileNotFoundError(f"no sharded dataset at {dataset_path}")
+        return ShardedDataset(dataset_path)
+    return JsonDataset(dataset_path)
@@ -1,5 +1,9 @@
 import json
-from table_class import LineScore, PitcherBoxscore,BatterBoxscore
+import os
+import random
+from collections import Counter
+from table_class import LineScore, PitcherBoxscore,BatterBoxscore, TableParseError
+from dataset import open_dataset
 
 def get_table_class():
     option = input("select evaluation option:\n"
@@ -17,38 +21,186 @@ def get_table_class():
         print("please select valid option")
         return get_table_class()
 
+def failure_category(e: Exception) -> str:
+    """e.g. "output missing header" for parse errors, "unexpected KeyError" otherwise"""
+    if isinstance(e, TableParseError):
+        return f"{e.source} {e.category}".strip()
+    return f"unexpected {type(e).__name__}"
+
 def evaluate_file(filepath):
     TableClass = get_table_class()
     
     rmse_list = []
     acc_list = []
+    totals_acc_list = []    # R/H/E totals of line scores, scored apart from the innings
     full_acc = 0
-    with open(filepath,"r") as file:
-        data = json.load(file)
+    unmatched_rows = 0
+    # games that failed are counted by category and written to a side file instead of aborting the run
+    failures = Counter()
+    failed_games = []
+    data = open_dataset(filepath)
+    
+    for game in data:
+        if "game_id" not in game:
+            failures["missing game_id"] += 1
+            failed_games.append({**game, "error": {"category": "missing game_id", "message": "record has no game_id"}})
+            print(f"record #{len(acc_list) + len(failed_games)} failed: missing game_id")
+            continue
         
-        for game in data:
-            table = TableClass(game["ground"], game["output"])
-            
+        try:
+            table = TableClass(game.get("ground"), game.get("output"))
             rmse = table.eval_rmse()
-            rmse_list.append(rmse)
-            
             acc = table.eval_acc()
-            acc_list.append(acc)
-            if acc == 1:
-                full_acc += 1
-            
-            print(f"gameID <{game['game_id']}> RMSE: {rmse:.4f}, ACC: {acc:.4f}")
-            
-    avg_rmse = sum(rmse_list)/len(rmse_list)
-    avg_acc = sum(acc_list)/len(acc_list)
-    full_acc_percentage = full_acc / len(acc_list)
-    print(f"Evaluated {len(data)} games:")
-    print(f"avg rmse: {avg_rmse:.4f}, min: {min(rmse_list):.4f}, max: {max(rmse_list):.4f}")
-    print(f"avg accuracy: {avg_acc:.4f}, min: {min(acc_list):.4f}, max: {max(acc_list):.4f}")
-    print(f"full accuracy percentage: {full_acc_percentage}")
+            totals_acc = table.eval_totals_acc() if isinstance(table, LineScore) else None
+        except Exception as e:
+            category = failure_category(e)
+            message = e.message if isinstance(e, TableParseError) else str(e)
+            failures[category] += 1
+            failed_games.append({**game, "error": {"category": category, "message": message}})
+            print(f"gameID <{game.get('game_id')}> failed: {category}: {message}")
+            continue
+        
+        rmse_list.append(rmse)
+        acc_list.append(acc)
+        if acc == 1:
+            full_acc += 1
+        
+        totals_text = ""
+        if totals_acc is not None:
+            totals_acc_list.append(totals_acc)
+            totals_text = f", R/H/E ACC: {totals_acc:.4f}"
+        print(f"gameID <{game['game_id']}> RMSE: {rmse:.4f}, ACC: {acc:.4f}{totals_text}")
+        
+        # rows that could not be aligned are scored against 0
+        alignment = table.alignment
+        if alignment.unmatched_ground or alignment.unmatched_output:
+            unmatched_rows += len(alignment.unmatched_ground) + len(alignment.unmatched_output)
+            print(f"    unmatched ground rows: {alignment.unmatched_ground}, unmatched output rows: {alignment.unmatched_output}")
+        
+    print(f"Evaluated {len(acc_list)} of {len(data)} games:")
+    if acc_list:
+        avg_rmse = sum(rmse_list)/len(rmse_list)
+        avg_acc = sum(acc_list)/len(acc_list)
+        full_acc_percentage = full_acc / len(acc_list)
+        print(f"avg rmse: {avg_rmse:.4f}, min: {min(rmse_list):.4f}, max: {max(rmse_list):.4f}")
+        print(f"avg accuracy: {avg_acc:.4f}, min: {min(acc_list):.4f}, max: {max(acc_list):.4f}")
+        print(f"full accuracy percentage: {full_acc_percentage}")
+    if totals_acc_list:
+        print(f"avg R/H/E accuracy: {sum(totals_acc_list)/len(totals_acc_list):.4f} over {len(totals_acc_list)} games with totals")
+    print(f"unmatched rows penalized: {unmatched_rows}")
+    
+    if failed_games:
+        errors_path = os.path.splitext(filepath.rstrip("/\\"))[0] + "_errors.json"
+        with open(errors_path, "w") as file:
+            json.dump(failed_games, file, indent=4)
+        
+        print(f"failed {len(failed_games)} games, written to {errors_path}:")
+        for category, count in failures.most_common():
+            print(f"    {category}: {count}")
+
+def bootstrap_ci(values: list[float], rng: random.Random, n_resamples: int = 1000, confidence: float = 0.95) -> tuple[float, float, float]:
+    """mean of values and its bootstrap percentile confidence interval
+
+    Returns:
+        tuple[float, float, float]: mean, lower bound, upper bound
+    """
+    n = len(values)
+    means = sorted(sum(rng.choices(values, k=n)) / n for _ in range(n_resamples))
+    tail = (1 - confidence) / 2
+    return sum(values) / n, means[int(tail * (n_resamples - 1))], means[int((1 - tail) * (n_resamples - 1))]
+
+def stratified_sample_order(n_games: int, rng: random.Random, n_strata: int = 10) -> list[int]:
+    """Order to sample game indices in, so that any prefix of it is a stratified random sample.
+    Games of a file are in schedule order, so consecutive blocks of games are the strata;
+    indices are shuffled within each block and the blocks are taken in turns.
+    """
+    n_strata = max(1, min(n_strata, n_games))
+    strata = [list(range(n_games * i // n_strata, n_games * (i + 1) // n_strata)) for i in range(n_strata)]
+    for stratum in strata:
+        rng.shuffle(stratum)
+        
+    order = []
+    for i in range(max(len(stratum) for stratum in strata)):
+        # start each round from a random stratum so no block is always sampled first
+        for stratum in rng.sample(strata, len(strata)):
+            if i < len(stratum):
+                order.append(stratum[i])
+    return order
+
+def quick_evaluate_file(filepath: str, compare_filepath: str = "", max_games: int = 300, min_games: int = 30,
+                        target_half_width: float = 0.02, check_every: int = 10, seed: int = 0):
+    """Evaluate a stratified random sample of games with 95% bootstrap confidence intervals,
+    stopping once the interval of the accuracy is narrower than ±target_half_width or max_games are scored.
+    With compare_filepath, both files are scored on the same games and the interval is of the paired
+    difference (compare - file), the change is significant if the interval does not contain 0.
+    Games that fail to parse in either file are skipped.
+    """
+    TableClass = get_table_class()
+    rng = random.Random(seed)
+    
+    # only the sampled records are read from sharded datasets
+    data = open_dataset(filepath)
+    game_ids = data.game_ids()
+    if compare_filepath:
+        compare_data = open_dataset(compare_filepath)
+        game_ids = [game_id for game_id in game_ids if game_id in compare_data]
+    
+    def score(game: dict) -> tuple[float, float]:
+        table = TableClass(game.get("ground"), game.get("output"))
+        return table.eval_rmse(), table.eval_acc()
+    
+    rmse_list = []
+    acc_list = []
+    failures = Counter()
+    for i in stratified_sample_order(len(game_ids), rng):
+        game = data.get(game_ids[i])
+        try:
+            rmse, acc = score(game)
+            if compare_filepath:
+                compare_rmse, compare_acc = score(compare_data.get(game["game_id"]))
+                rmse, acc = compare_rmse - rmse, compare_acc - acc
+        except Exception as e:
+            failures[failure_category(e)] += 1
+            continue
+        
+        rmse_list.append(rmse)
+        acc_list.append(acc)
+        if len(acc_list) >= max_games:
+            break
+        if len(acc_list) >= min_games and len(acc_list) % check_every == 0:
+            _, low, high = bootstrap_ci(acc_list, rng)
+            if (high - low) / 2 <= target_half_width:
+                break
+    
+    if not acc_list:
+        print(f"no games could be scored, failures: {dict(failures)}")
+        return
+    
+    label = "difference of " if compare_filepath else ""
+    print(f"Sampled {len(acc_list)} of {len(game_ids)} games ({sum(failures.values())} failed to parse):")
+    for name, values in (("rmse", rmse_list), ("accuracy", acc_list)):
+        # the interval of the accuracy printed last is also the one the verdict is based on
+        mean, low, high = bootstrap_ci(values, rng)
+        print(f"{label}{name}: {mean:.4f}, 95% CI: [{low:.4f}, {high:.4f}]")
+    if compare_filepath:
+        verdict = "no significant change" if low <= 0 <= high else ("improved" if low > 0 else "worse")
+        print(f"accuracy of {compare_filepath}: {verdict}")
+    for category, count in failures.most_common():
+        print(f"    {category}: {count}")
 
 if __name__ == "__main__":
 
     filepath = input("input file path: ")
-    evaluate_file(filepath)
+    mode = input("select evaluation mode:\n"
+                 "1. all games\n"
+                 "2. quick, on a sample of games\n"
+                 "3. quick, compare with another output file on the same sample of games\n")
+    
+    if mode == "2":
+        quick_evaluate_file(filepath)
+    elif mode == "3":
+        compare_filepath = input("output file path to compare: ")
+        quick_evaluate_file(filepath, compare_filepath)
+    else:
+        evaluate_file(filepath)
     
\ No newline at end of file
@@ -1,21 +1,36 @@
+from __future__ import annotations
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
 import json
-from google import genai
-from google.genai import types
-from typing import Callable
+from functools import lru_cache
+from typing import Callable, TYPE_CHECKING
 import time
+from dataset import ShardedDataset, is_sharded, open_dataset, parse_shard_range
+
+if TYPE_CHECKING:
+    from google.genai import types
 
 load_dotenv()
-openai_api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI()
 
-def prompt_gemini(input:str, system_instruction: types.ContentUnion | None = None)->str:
-    client = genai.Client(
+# provider SDKs are slow to import and the OpenAI client fails without a key,
+# so clients are only created the first time a model is prompted
+@lru_cache(maxsize=None)
+def get_openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+@lru_cache(maxsize=None)
+def get_gemini_client():
+    from google import genai
+    return genai.Client(
         api_key=os.environ.get("GEMINI_API_KEY"),
     )
 
+def prompt_gemini(input:str, system_instruction: types.ContentUnion | None = None)->str:
+    from google.genai import types
+    
+    client = get_gemini_client()
+
     model = "gemini-2.0-flash"
     contents = [
         types.Content(
@@ -38,7 +53,7 @@ def prompt_gemini(input:str, system_instruction: types.ContentUnion | None = Non
     return response.text
 
 def prompt_4o_mini(input:str)->str:
-    response = client.responses.create(
+    response = get_openai_client().responses.create(
         model="gpt-4o-mini",
         input=input
     )
@@ -75,27 +90,38 @@ def append_output(filepath: str, data: dict):
     with open(filepath, "w") as file:
         json.dump(new_data,file,indent=4)   
 
-def generate_gemini(in_file_path, prompt, instructions, start_id:str = ""):
-    path_with_output = os.path.splitext(in_file_path)[0] + "_output.json"
+def generate_gemini(in_file_path, prompt, instructions, start_id:str = "", shards: list[int] | None = None):
+    """Generate output for every game of the input starting at start_id.
+    Outputs of a sharded input dataset go to the sharded `<input>_output` dataset, in the same shard as the input,
+    so processes given separate `shards` to generate do not contend, and games already generated are skipped.
+    Outputs of a .json input file are appended to `<input>_output.json`.
+    
+    Raises:
+        ValueError: if start_id is not a game of the input, or of the given shards
+    """
+    games = open_dataset(in_file_path)
+    game_ids = games.game_ids()
     
-    in_file = open(in_file_path,"r")
-    games = json.load(in_file)
-    in_file.close()
+    if is_sharded(in_file_path) and shards is not None:
+        game_ids = [game_id for game_id in game_ids if games.shard_of(game_id) in shards]
     
-    if start_id =="":
-        starts = True
+    # skip until given game id to generate
+    if start_id != "":
+        if start_id not in game_ids:
+            raise ValueError(f"start game {start_id} is not in {in_file_path}" + (f" shards {shards}" if shards is not None else ""))
+        game_ids = game_ids[game_ids.index(start_id):]
+    
+    if is_sharded(in_file_path):
+        out_dataset = ShardedDataset(in_file_path.rstrip("/\\") + "_output")
+        game_ids = [game_id for game_id in game_ids if game_id not in out_dataset]
+        write_output = lambda game: out_dataset.append(game, shard=games.shard_of(game["game_id"]))
     else:
-        starts = False
+        path_with_output = os.path.splitext(in_file_path)[0] + "_output.json"
+        write_output = lambda game: append_output(path_with_output, game)
         
     i = 0
-    while i < len(games):
-        game = games[i]
-        # skip until given game id to generate
-        if game['game_id'] == start_id:
-            starts = True
-        if not starts:
-            i+=1
-            continue
+    while i < len(game_ids):
+        game = games.get(game_ids[i])
         
         print(f"generating for game: {game['game_id']}")
         input_text = prompt + game["input"]
@@ -103,7 +129,7 @@ def generate_gemini(in_file_path, prompt, instructions, start_id:str = ""):
             output = prompt_gemini(input_text,instructions)
             game["output"] = output
         
-            append_output(path_with_output, game)    
+            write_output(game)
         except Exception as e:
             print(f"Error while generating, {e}")
             i-=1    # retry
@@ -112,34 +138,36 @@ def generate_gemini(in_file_path, prompt, instructions, start_id:str = ""):
         i+=1
         time.sleep(4.5)   # limit request rate to meet free quota
 
-def generate_line_scores(filepath:str):    
-    prompt = "Generate a table with line score from 1 through 9 inning of each team according to the following MLB play-by-play script:\n"
+def generate_line_scores(filepath:str, shards: list[int] | None = None):
+    prompt = ("Generate a table with line score of every inning played, including extra innings, "
+              "and the total runs, hits and errors of each team according to the following MLB play-by-play script:\n")
     instructions = ("The header of the final generated table should be in the format of \n "
-                    "| Team | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 |\n| - | - | - | - | - | - | - | - | - | - |\n"
-                    "and team names should be identical to that in the play-by-play script. "
+                    "| Team | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 | R | H | E |\n| - | - | - | - | - | - | - | - | - | - | - | - | - |\n"
+                    "with a column after 9 for each extra inning, e.g. | 10 | 11 |, before R, H and E. "
+                    "Team names should be identical to that in the play-by-play script. "
                     "Use the '-' character for innings that were not played because the game ended early")
     
-    generate_gemini(filepath,prompt,instructions)
+    generate_gemini(filepath,prompt,instructions,shards=shards)
             
-def generate_pitcher_box_score(filepath:str):
+def generate_pitcher_box_score(filepath:str, shards: list[int] | None = None):
     prompt = "According to the following MLB play-by-play script, generate a table of stats including Innings pitched, Hits, Runs, Walks, Strike outs, and Home runs of each pitcher for both teams:\n"
     instructions = ("The header of the final generated table should be in the format of \n "
                     "| Pitcher | IP | H | R | BB | K | HR | \n | - | - | - | - | - | - | - | \n "
                     "Where IP is innings pitched, H is hits, R is runs, BB is walks, K is strike outs, and HR is home runs.")
     
-    generate_gemini(filepath,prompt,instructions)
+    generate_gemini(filepath,prompt,instructions,shards=shards)
 
-def generate_batter_box_score(filepath: str):
+def generate_batter_box_score(filepath: str, shards: list[int] | None = None):
     prompt = ("According to the following MLB play-by-play script, generate a table of batting stats for each player including At-Bats (AB), Runs (R), Hits (H), Runs Batted In (RBI), "
               "Home Runs (HR), Walks (BB), Strikeouts (K), Batting Average (AVG), On-Base Percentage (OBP), and Slugging Percentage (SLG):\n")
     instructions = ("Header format:\n"
                     "| Team | Player | Pos | AB | R | H | RBI | HR | BB | K | AVG | OBP | SLG |\n"
                     "| - | - | - | - | - | - | - | - | - | - | - | - | - |\n"
                     "Use team and player names exactly from the script. Estimate stats if needed, but do not invent players.")
-    generate_gemini(filepath, prompt, instructions)
+    generate_gemini(filepath, prompt, instructions, shards=shards)
 
-def generate_line_scores_solution(filepath: str):
-    prompt = """According to the following MLB play-by-play script, provide the reasoning by following the steps, then generate a table of line score of each team from the reasoning.
+def generate_line_scores_solution(filepath: str, shards: list[int] | None = None):
+    prompt = """According to the following MLB play-by-play script, provide the reasoning by following the steps, then generate a table of line score of each team from the reasoning, including extra innings.
 
 Reasoning:
 Process sentence by sentence:
@@ -149,18 +177,20 @@ Process sentence by sentence:
 4. current offensing team = the other team
 4. if sentence is "<Pitcher> PITCHING FOR <TEAM>." and TEAM is not equal to current defending team, then change inning, and make current offensing team = current defending team, current defending team  = TEAM.
 5. runs[top ot bottom][inning] = number of scored runs.
-6. list all innings and the attribute values in each inning.
+6. hits[top or bottom] = number of hits of the offensing team, errors[current defending team] = number of errors made by the current defending team.
+7. list all innings and the attribute values in each inning.
 
 Play-by-play:
 """
     instructions = """The header of the final generated table should be in the format of
-| Team | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 |
-| - | - | - | - | - | - | - | - | - | - |
-where cell values are "runs[top or bottom][inning]"."""
+| Team | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 | R | H | E |
+| - | - | - | - | - | - | - | - | - | - | - | - | - |
+with a column after 9 for each extra inning, e.g. | 10 | 11 |, before R, H and E,
+where inning cell values are "runs[top or bottom][inning]" and R, H, E are the total runs, hits and errors of the team."""
     
-    generate_gemini(filepath, prompt, instructions)
+    generate_gemini(filepath, prompt, instructions, shards=shards)
 
-def generate_pitcher_box_solution(filepath: str):
+def generate_pitcher_box_solution(filepath: str, shards: list[int] | None = None):
     prompt = """According to the following MLB play-by-play script, provide the reasoning by following the steps, then generate a table of pitcher's box score on both teams from the reasoning.
 
 Reasoning:
@@ -185,12 +215,22 @@ Play-by-play:
  | - | - | - | - | - | - | - |
 where pitchers' names should be exactly as it was mentioned in the input."""
     
-    generate_gemini(filepath, prompt, instructions,"401568928")
+    generate_gemini(filepath, prompt, instructions, shards=shards)
 
 if __name__ == "__main__":
 
     filepath = input("input file path: ")
     
+    # separate processes can generate separate shards of a sharded dataset
+    shards = None
+    if is_sharded(filepath):
+        while True:
+            try:
+                shards = parse_shard_range(input("press enter to generate all shards or type in a shard or shard range (e.g. 3 or 3-5): "))
+                break
+            except ValueError as e:
+                print(e)
+    
     func_code = input("Select generation table: \n"
                       "1. line scores\n"
                       "2. box scores for pitchers\n"
@@ -199,13 +239,13 @@ if __name__ == "__main__":
                       "5. pitcher box scores solution\n")
     
     if func_code == "1":
-        generate_line_scores(filepath)
+        generate_line_scores(filepath, shards)
     elif func_code == "2":
-        generate_pitcher_box_score(filepath)
+        generate_pitcher_box_score(filepath, shards)
     elif func_code == "3":
-        generate_batter_box_score(filepath)
+        generate_batter_box_score(filepath, shards)
     elif func_code == "4":
-        generate_line_scores_solution(filepath)
+        generate_line_scores_solution(filepath, shards)
     elif func_code == "5":
-        generate_pitcher_box_solution(filepath)
+        generate_pitcher_box_solution(filepath, shards)
     
\ No newline at end of file
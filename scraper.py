@@ -1,17 +1,305 @@
-from selenium import webdriver
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from __future__ import annotations
 import time
 import datetime
 import json
+import csv
+import os
+import re
 from os import path,makedirs
-import pandas as pd
-from functools import reduce
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from dataset import SHARD_SIZE, ShardedDataset, is_sharded, parse_shard_range
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from selenium.webdriver.common.by import By
 
 OUTPUT_DIR = "./outputs"
 GAMEID_FILE = "gameIds.csv"
+DRIVER_PATH_CACHE = ".chromedriver_path"
+# set to a directory to save every loaded page, to run the extractors on them offline later
+RECORD_DIR = ""
+REPLAY_DIR = "./recorded_pages"
+
+# the browser is restarted after this many page loads or when it uses more memory (MB)
+MAX_PAGES_PER_BROWSER = 50
+MAX_BROWSER_RSS_MB = 1500
+
+# requests the extracted tables do not need: images, media, fonts, ads and trackers
+BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*google-analytics.com*",
+    "*googletagservices.com*", "*adnxs.com*", "*amazon-adsystem.com*", "*scorecardresearch.com*",
+    "*chartbeat.com*", "*chartbeat.net*", "*omtrdc.net*", "*demdex.net*", "*outbrain.com*", "*taboola.com*",
+    "*moatads.com*", "*krxd.net*", "*facebook.net*", "*twitter.com*", "*optimizely.com*", "*nr-data.net*",
+]
+
+@lru_cache(maxsize=None)
+def get_chromedriver_path(refresh: bool = False) -> str:
+    """Returns the path of the chromedriver binary.
+    `ChromeDriverManager().install()` checks the latest release online on every call,
+    so the installed path is cached in memory and in `DRIVER_PATH_CACHE` across runs.
+    The `CHROMEDRIVER_PATH` environment variable overrides it, e.g. on machines without internet.
+    
+    Args:
+        refresh (bool): ignore the cached path and install the driver matching the current Chrome,
+            e.g. after Chrome updated itself
+    """
+    if os.environ.get("CHROMEDRIVER_PATH"):
+        return os.environ["CHROMEDRIVER_PATH"]
+    
+    try:
+        with open(DRIVER_PATH_CACHE, "r") as file:
+            driver_path = file.read().strip()
+        if path.isfile(driver_path) and not refresh:
+            return driver_path
+    except FileNotFoundError:
+        pass
+    
+    from webdriver_manager.chrome import ChromeDriverManager
+    driver_path = ChromeDriverManager().install()
+    
+    with open(DRIVER_PATH_CACHE, "w") as file:
+        file.write(driver_path)
+        
+    return driver_path
+
+def create_driver(window_size: str | None = None, offline: bool = False) -> WebDriver:
+    """Set up a headless Chrome WebDriver that does not load images, media, fonts, ads and trackers,
+    selenium is only imported here.
+
+    Args:
+        window_size (str | None): e.g. "1920,1080" for consistent layout
+        offline (bool): for recorded pages, disables javascript so they are not re-rendered by their scripts
+            and blocks every http(s) request, e.g. the stylesheets they link to
+    """
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+    
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")  # Run without opening a browser
+    if window_size:
+        options.add_argument(f"window-size={window_size}")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_argument("--disable-extensions")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.managed_default_content_settings.javascript": 2 if offline else 1,
+    })
+    try:
+        driver = webdriver.Chrome(service=Service(get_chromedriver_path()),options=options)
+    except SessionNotCreatedException:
+        # the cached driver does not support the installed Chrome anymore, install a matching one once
+        if os.environ.get("CHROMEDRIVER_PATH"):
+            raise
+        get_chromedriver_path.cache_clear()
+        driver = webdriver.Chrome(service=Service(get_chromedriver_path(refresh=True)),options=options)
+    
+    driver.execute_cdp_cmd("Network.enable", {})
+    blocked_urls = ["http://*", "https://*"] if offline else BLOCKED_URLS
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+    return driver
+
+def process_tree_rss_mb(pid: int) -> float | None:
+    """Resident memory in MB of a process and all its descendants, e.g. chromedriver and the browser it started.
+    Uses psutil if installed, otherwise /proc on Linux. Returns None if it can not be measured.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes if p.is_running()) / 2**20
+        except psutil.Error:
+            return None
+        
+    if not path.isdir("/proc"):
+        return None
+    
+    # map parent pid to child pids
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                # the command name in parentheses may contain spaces
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    
+    rss_kb = 0
+    stack = [pid]
+    while stack:
+        p = stack.pop()
+        stack.extend(children.get(p, []))
+        try:
+            with open(f"/proc/{p}/status", "r") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        rss_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        
+    return rss_kb / 1024
+
+def page_file(url: str) -> str:
+    """file name of a recorded page
+    e.g. https://www.espn.com/mlb/boxscore/_/gameId/401694908 -> www.espn.com_mlb_boxscore___gameId_401694908.html
+    """
+    return re.sub(r"[^A-Za-z0-9.]", "_", re.sub(r"^\w+://", "", url)) + ".html"
+
+class ManagedDriver:
+    """Chrome WebDriver that is restarted after `max_pages` page loads
+    or when the browser uses more than `max_rss_mb` of memory, to keep memory from growing over a long run.
+    Records the load time of each page and the browser memory after it.
+    Other attributes are forwarded to the current WebDriver, so it can be passed to the extractors.
+    
+    With `record_dir`, the rendered DOM of every page is saved when the driver leaves it.
+    With `replay_dir`, urls are served from those saved pages with javascript disabled and every http(s) request blocked,
+    so no network is used.
+    """
+    
+    def __init__(self, window_size: str | None = None, max_pages: int = MAX_PAGES_PER_BROWSER, max_rss_mb: float = MAX_BROWSER_RSS_MB,
+                 record_dir: str = "", replay_dir: str = ""):
+        self.window_size = window_size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.record_dir = record_dir
+        self.replay_dir = replay_dir
+        if record_dir:
+            makedirs(record_dir, exist_ok=True)
+        
+        self.driver: WebDriver | None = None
+        self.url = ""       # url of the current page
+        self.pages = 0      # pages loaded by the current browser
+        self.restarts = 0
+        self.load_times: list[float] = []
+        self.rss_samples: list[float] = []
+        
+    def start(self):
+        self.driver = create_driver(self.window_size, offline=bool(self.replay_dir))
+        self.pages = 0
+        
+    def save_page(self):
+        """save the current page if recording, it is saved when leaving so the extractors had time to wait for it"""
+        if self.record_dir and self.driver is not None and self.url:
+            with open(path.join(self.record_dir, page_file(self.url)), "w", encoding="utf-8") as file:
+                file.write(self.driver.page_source)
+        self.url = ""
+        
+    def quit(self):
+        if self.driver is not None:
+            self.save_page()
+            self.driver.quit()
+            self.driver = None
+            
+    def restart(self):
+        self.quit()
+        self.start()
+        self.restarts += 1
+        
+    def browser_rss_mb(self) -> float | None:
+        if self.driver is None:
+            return None
+        return process_tree_rss_mb(self.driver.service.process.pid)
+        
+    def get(self, url: str, settle_time: float = 0):
+        """load the url, starting or recycling the browser first if needed
+        
+        Args:
+            url (str): page to load
+            settle_time (float): seconds to wait for the scripts of a live page to render,
+                for pages that are not polled with wait_el_text. Not waited for recorded pages, they are already rendered
+        
+        Raises:
+            FileNotFoundError: if replaying and the page was not recorded
+        """
+        self.save_page()
+        if self.driver is None:
+            self.start()
+        elif self.pages >= self.max_pages or (self.rss_samples and self.rss_samples[-1] > self.max_rss_mb):
+            self.restart()
+            
+        load_url = url
+        if self.replay_dir:
+            file_path = path.abspath(path.join(self.replay_dir, page_file(url)))
+            if not path.isfile(file_path):
+                raise FileNotFoundError(f"page not recorded: {url}")
+            load_url = "file://" + file_path
+        
+        start = time.perf_counter()
+        self.driver.get(load_url)
+        self.load_times.append(time.perf_counter() - start)
+        self.pages += 1
+        self.url = url
+        if not self.replay_dir:
+            time.sleep(settle_time)
+        
+        rss = self.browser_rss_mb()
+        if rss is not None:
+            self.rss_samples.append(rss)
+            
+    def stats(self) -> str:
+        if not self.load_times:
+            return "no pages loaded"
+        
+        load_times = sorted(self.load_times)
+        stats = (f"pages: {len(load_times)}, browser restarts: {self.restarts}, "
+                 f"load time avg: {sum(load_times)/len(load_times):.2f}s, "
+                 f"median: {load_times[len(load_times)//2]:.2f}s, max: {load_times[-1]:.2f}s")
+        if self.rss_samples:
+            stats += f", browser RSS last: {self.rss_samples[-1]:.0f}MB, max: {max(self.rss_samples):.0f}MB"
+        return stats
+    
+    def __getattr__(self, name: str):
+        # only called for attributes not defined above, e.g. find_element
+        if name == "driver" or name.startswith("__"):
+            raise AttributeError(name)
+        if self.driver is None:
+            self.start()
+        return getattr(self.driver, name)
+
+def select_games(out_file: str) -> list[tuple[str, int | None]]:
+    """read game ids and ask which shards to scrape if the output is a sharded dataset,
+    so that separate processes can scrape separate shards of the same dataset.
+    The game at position i of `GAMEID_FILE` belongs to shard i // SHARD_SIZE.
+
+    Returns:
+        list[tuple[str, int | None]]: game id and the shard to write it to, None for the last shard
+    """
+    game_ids = read_game_ids()
+    if not is_sharded(out_file):
+        return [(game_id, None) for game_id in game_ids]
+    
+    n_shards = (len(game_ids) + SHARD_SIZE - 1) // SHARD_SIZE
+    while True:
+        try:
+            shards = parse_shard_range(input(f"press enter to scrape all games or type in a shard or shard range to scrape (0-{n_shards-1}, e.g. 3 or 3-5): "))
+            break
+        except ValueError as e:
+            print(e)
+    if shards is None:
+        return [(game_id, None) for game_id in game_ids]
+    return [(game_id, i // SHARD_SIZE) for i, game_id in enumerate(game_ids) if i // SHARD_SIZE in shards]
+
+def read_game_ids(file_name: str = GAMEID_FILE) -> list[str]:
+    """read game ids from the `gameIds` column of the csv file
+    """
+    with open(file_name, "r", newline="") as file:
+        return [row["gameIds"].strip() for row in csv.DictReader(file) if row["gameIds"].strip()]
 
 def wait_el_text(driver, selector: By, el_path: str, interval: float = 2, timeout: float= 10):
     """Returns element text content when it is loaded, 
@@ -40,7 +328,22 @@ def wait_el_text(driver, selector: By, el_path: str, interval: float = 2, timeou
         
     raise TimeoutError(f"Timeout while waiting element at: {el_path} to load")
 
-def append_json(file_name:str, data:list):
+@lru_cache(maxsize=None)
+def output_dataset(file_name: str) -> ShardedDataset:
+    return ShardedDataset(path.join(OUTPUT_DIR,file_name))
+
+def append_json(file_name:str, data:list, shard: int | None = None):
+    """append records to the output, a sharded dataset directory unless file_name ends with .json
+
+    Args:
+        shard (int | None): shard of the dataset to append to, by default the last one
+    """
+    if is_sharded(file_name):
+        dataset = output_dataset(file_name)
+        for record in data:
+            dataset.append(record, shard)
+        return
+    
     try:
         with open(path.join(OUTPUT_DIR,file_name), "r") as file:
             new_data = json.load(file)  # Load existing content
@@ -60,12 +363,13 @@ def append_json(file_name:str, data:list):
 def MLB_play_by_play(driver, game_id):
     """returns play-by-play script in one string
     """
+    from selenium.webdriver.common.by import By
+    
     print(f"extracting play-by-play: {game_id}")
     play_url = "https://www.espn.com/mlb/playbyplay/_/gameId/" + game_id
     play_class_name = "PlayHeader__description"
     
-    driver.get(play_url)
-    time.sleep(2)  # Wait for the page to load (adjust as needed)
+    driver.get(play_url, settle_time=2)  # Wait for the page to load (adjust as needed)
     
     # Find elements by class name
     divs = driver.find_elements(By.CLASS_NAME, play_class_name)
@@ -85,8 +389,11 @@ def MLB_play_by_play(driver, game_id):
     return joined_text
         
 def mlb_line_score(driver, game_id, load_url: bool = False):
-    """returns line score table in markdown format
+    """returns line score table in markdown format,
+    with a column for every inning played including extra innings, followed by R, H and E
     """
+    from selenium.webdriver.common.by import By
+    
     print(f"extracting linescore: {game_id}")
     play_url = "https://www.espn.com/mlb/playbyplay/_/gameId/" + game_id
     
@@ -102,15 +409,20 @@ def mlb_line_score(driver, game_id, load_url: bool = False):
     team2 = team_table.find_element(By.CSS_SELECTOR,"tr:nth-of-type(3) a.AnchorLink:nth-child(2)").text
     
     score_table = driver.find_element(By.CSS_SELECTOR,"div.LineScore div.Table__ScrollerWrapper table")
-    team1_scores = score_table.find_elements(By.CSS_SELECTOR,"tbody tr:nth-child(1) td:nth-of-type(-n+9)")
-    team2_scores = score_table.find_elements(By.CSS_SELECTOR,"tbody tr:nth-child(2) td:nth-of-type(-n+9)")
+    headers = [th.text.strip() for th in score_table.find_elements(By.CSS_SELECTOR,"thead th")]
+    team1_scores = score_table.find_elements(By.CSS_SELECTOR,"tbody tr:nth-child(1) td")
+    team2_scores = score_table.find_elements(By.CSS_SELECTOR,"tbody tr:nth-child(2) td")
+    
+    # inning columns 1 to n followed by R, H, E
+    columns = [i for i, header in enumerate(headers) if header.isdigit() or header in ("R", "H", "E")]
     
-    md_table = "| Team | 1 | 2 | 3 | 4 | 5 | 6 | 7 | 8 | 9 |\n| - | - | - | - | - | - | - | - | - | - |\n"
+    md_table = "| Team | " + " | ".join(headers[i] for i in columns) + " |\n|" + " - |" * (len(columns) + 1) + "\n"
     team1_row = f"| {team1} | "
     team2_row = f"| {team2} | "
-    for i in range(9):
-        team1_row += team1_scores[i].text + ' | '
-        team2_row += team2_scores[i].text + ' | '
+    for i in columns:
+        # innings not played are empty or 'X'
+        team1_row += (team1_scores[i].text.strip() or '-') + ' | '
+        team2_row += (team2_scores[i].text.strip() or '-') + ' | '
     
     return md_table+team1_row+'\n'+team2_row
         
@@ -121,27 +433,23 @@ def mlb_play_n_score():
     """
     chunksize = 5
     print(f"make sure gameIds is at `{path.join(GAMEID_FILE)}`")
-    out_file = input("press enter for a new output file name or type in the output file to append to: ")
+    out_file = input("press enter for a new output dataset or type in the output dataset (or .json file) to append to: ")
     if not out_file:
-        out_file = "mlb_play_n_score_"+datetime.datetime.now().strftime("%H%M%S")+ ".json"
+        out_file = "mlb_play_n_score_"+datetime.datetime.now().strftime("%H%M%S")
     
     
-    # read game ids and prepend url
-    df = pd.read_csv(GAMEID_FILE,dtype={"gameIds":"str"})
-    game_ids = df["gameIds"].tolist()
-    print(f"extracting from {len(game_ids)} mlb games.")
+    # read game ids
+    games = select_games(out_file)
+    print(f"extracting from {len(games)} mlb games.")
     
     # create output directory if not exists 
     makedirs(OUTPUT_DIR ,exist_ok=True)
     
     # Set up the Selenium WebDriver
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")  # Run without opening a browser
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service,options=options)
+    driver = ManagedDriver(record_dir=RECORD_DIR)
     
     # scrape data
-    for game_id in game_ids:
+    for game_id, shard in games:
         transcript = MLB_play_by_play(driver, game_id)
         line_score = mlb_line_score(driver,game_id)
         
@@ -150,12 +458,15 @@ def mlb_play_n_score():
             "game_id": game_id,
             "input": transcript,
             "ground": line_score
-        }])
+        }], shard)
     
+    print(driver.stats())
     driver.quit()
     
 
 def mlb_pitcher_box(driver: WebDriver, game_id, load_url: bool = False) -> str:
+    from selenium.webdriver.common.by import By
+    
     print(f"extracting pitcher boxscore: {game_id}")
     play_url = "https://www.espn.com/mlb/boxscore/_/gameId/" + game_id
     
@@ -189,40 +500,38 @@ def mlb_pitcher_box(driver: WebDriver, game_id, load_url: bool = False) -> str:
 
 def mlb_play_pitcher_box():
     print(f"make sure gameIds is at `{path.join(GAMEID_FILE)}`")
-    out_file = input("press enter for a new output file name or type in the output file to append to: ")
+    out_file = input("press enter for a new output dataset or type in the output dataset (or .json file) to append to: ")
     if not out_file:
-        out_file = "mlb_play_pitcher_box_"+datetime.datetime.now().strftime("%H%M%S")+ ".json"
+        out_file = "mlb_play_pitcher_box_"+datetime.datetime.now().strftime("%H%M%S")
     
-    # read game ids and prepend url
-    df = pd.read_csv(GAMEID_FILE,dtype={"gameIds":"str"})
-    game_ids = df["gameIds"].tolist()
-    print(f"extracting from {len(game_ids)} mlb games.")
+    # read game ids
+    games = select_games(out_file)
+    print(f"extracting from {len(games)} mlb games.")
     
     # create output directory if not exists 
     makedirs(OUTPUT_DIR ,exist_ok=True)
     
     # Set up the Selenium WebDriver
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")  # Run without opening a browser
-    options.add_argument("window-size=1920,1080")   # for consistent layout
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service,options=options)
+    driver = ManagedDriver("1920,1080", record_dir=RECORD_DIR)   # for consistent layout
     
-    for game_id in game_ids:
+    for game_id, shard in games:
         transcript = MLB_play_by_play(driver, game_id)
         boxscore = mlb_pitcher_box(driver,game_id,True)
         
         # write to output file
-        append_json(out_file,{
+        append_json(out_file,[{
             "game_id": game_id,
             "input": transcript,
             "ground": boxscore
-        })
+        }], shard)
     
+    print(driver.stats())
     driver.quit()
     
     
 def mlb_batter_box(driver: WebDriver, game_id: str, load_url: bool = False) -> str:
+    from selenium.webdriver.common.by import By
+    
     print(f"Extracting batter boxscore: {game_id}")
     url = f"https://www.espn.com/mlb/boxscore/_/gameId/{game_id}"
 
@@ -275,27 +584,22 @@ def mlb_batter_box(driver: WebDriver, game_id: str, load_url: bool = False) -> s
 
 def mlb_play_batter_box():
     print(f"make sure gameIds is at `{path.join(GAMEID_FILE)}`")
-    out_file = input("Press enter for a new output file name or type in the output file to append to: ")
+    out_file = input("Press enter for a new output dataset or type in the output dataset (or .json file) to append to: ")
     if not out_file:
-        out_file = "mlb_play_batter_box_" + datetime.datetime.now().strftime("%H%M%S") + ".json"
+        out_file = "mlb_play_batter_box_" + datetime.datetime.now().strftime("%H%M%S")
 
     # Read game IDs
-    df = pd.read_csv(GAMEID_FILE, dtype={"gameIds": "str"})
-    game_ids = df["gameIds"].tolist()
-    print(f"Extracting from {len(game_ids)} MLB games.")
+    games = select_games(out_file)
+    print(f"Extracting from {len(games)} MLB games.")
 
     # Ensure output directory exists
     makedirs(OUTPUT_DIR, exist_ok=True)
 
     # Set up Selenium WebDriver
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless")
-    options.add_argument("window-size=1920,1080")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    driver = ManagedDriver("1920,1080", record_dir=RECORD_DIR)
 
     # Extract data
-    for game_id in game_ids:
+    for game_id, shard in games:
         try:
             transcript = MLB_play_by_play(driver, game_id)
             batter_box = mlb_batter_box(driver, game_id, True)
@@ -305,18 +609,71 @@ def mlb_play_batter_box():
                 "game_id": game_id,
                 "input": transcript,
                 "ground": batter_box
-            }])
+            }], shard)
         except Exception as e:
             print(f"⚠️ Error processing game {game_id}: {e}")
 
+    print(driver.stats())
+    driver.quit()
+
+def replay_extractors():
+    """Run every extractor on the pages recorded with `RECORD_DIR`, without network.
+    Prints the time taken by each extractor and writes the extracted tables to the output directory,
+    to check selector changes against the output of the live run.
+    """
+    replay_dir = input(f"press enter to replay pages in `{REPLAY_DIR}` or type in the directory of recorded pages: ")
+    if not replay_dir:
+        replay_dir = REPLAY_DIR
+    out_file = "replay_"+datetime.datetime.now().strftime("%H%M%S")+ ".json"
+    
+    # game ids of recorded play-by-play and boxscore pages
+    pages: dict[str, set[str]] = {}
+    for file_name in sorted(os.listdir(replay_dir)):
+        matched = re.search(r"_mlb_(playbyplay|boxscore)___gameId_(\d+)\.html$", file_name)
+        if matched:
+            pages.setdefault(matched.group(2), set()).add(matched.group(1))
+    print(f"replaying {len(pages)} mlb games.")
+    
+    makedirs(OUTPUT_DIR ,exist_ok=True)
+    driver = ManagedDriver("1920,1080", replay_dir=replay_dir)
+    
+    timings: dict[str, list[float]] = {}
+    def timed(name: str, extract, *args) -> str:
+        start = time.perf_counter()
+        result = extract(driver, *args)
+        timings.setdefault(name, []).append(time.perf_counter() - start)
+        return result
+    
+    results = []
+    for game_id, page_types in pages.items():
+        result = {"game_id": game_id}
+        try:
+            if "playbyplay" in page_types:
+                result["input"] = timed("play-by-play", MLB_play_by_play, game_id)
+                result["line_score"] = timed("line score", mlb_line_score, game_id)
+            if "boxscore" in page_types:
+                result["pitcher_box"] = timed("pitcher boxscore", mlb_pitcher_box, game_id, True)
+                result["batter_box"] = timed("batter boxscore", mlb_batter_box, game_id)
+        except Exception as e:
+            print(f"⚠️ Error replaying game {game_id}: {e}")
+            result["error"] = str(e)
+        results.append(result)
+        
     driver.quit()
+    append_json(out_file, results)
+    
+    for name, seconds in timings.items():
+        print(f"{name}: {len(seconds)} pages, total: {sum(seconds):.2f}s, avg: {sum(seconds)/len(seconds)*1000:.1f}ms")
+    print(driver.stats())
+    print(f"extracted tables written to {path.join(OUTPUT_DIR, out_file)}")
 
 if __name__ == "__main__":
 
     func_code = input("select func:\n"
           "1. MLB play-by-play and linescore\n"
           "2. MLB play-by-play and pitchers boxscore\n"
-          "3. MLB play-by-play and batters boxscore\n")
+          "3. MLB play-by-play and batters boxscore\n"
+          "4. replay recorded pages offline and benchmark the extractors\n")
     
     if func_code == "1":
         mlb_play_n_score()
@@ -324,5 +681,7 @@ if __name__ == "__main__":
         mlb_play_pitcher_box()
     elif func_code == '3':
         mlb_play_batter_box()
+    elif func_code == '4':
+        replay_extractors()
     
     
@@ -1,8 +1,366 @@
 from abc import ABC, abstractmethod
+from array import array
+from typing import Iterable, Iterator, Sequence
 import re
 import math
+import sys
+import unicodedata
+
+class NameIndex:
+    """Maps player and team names to row numbers.
+    Names are interned so the same name shared by many tables is stored once.
+    """
+    __slots__ = ("names", "rows")
+    
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: list[str] = []
+        self.rows: dict[str, int] = {}
+        for name in names:
+            self.add(name)
+            
+    def add(self, name: str) -> int:
+        """add name if not indexed yet and return its row number"""
+        row = self.rows.get(name)
+        if row is None:
+            name = sys.intern(name)
+            row = len(self.names)
+            self.rows[name] = row
+            self.names.append(name)
+        return row
+    
+    def __getstate__(self):
+        return (self.names,)
+    
+    def __setstate__(self, state: tuple[list[str]]):
+        # interned strings are not preserved by pickle, intern them again
+        self.__init__(state[0])
+        
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.rows
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+    
+    def __getitem__(self, name: str) -> int:
+        return self.rows[name]
+
+class StatTable:
+    """Numeric table of named rows stored column by column in one contiguous array.
+    Missing cells are NaN. Supports a subset of the dict interface keyed by row name,
+    where a row is a strided view over the array.
+    """
+    __slots__ = ("index", "columns", "values")
+    
+    def __init__(self, columns: Sequence[str], rows: Iterable[tuple[str, Sequence[float]]] = (), typecode: str = "d"):
+        """
+        Args:
+            columns (Sequence[str]): column names
+            rows (Iterable[tuple[str, Sequence[float]]]): row name and its values, 
+                rows with the same name are replaced by the latest one, missing values are NaN
+                and values beyond the number of columns are dropped
+            typecode (str): array typecode of the values
+        """
+        self.index = NameIndex()
+        self.columns = tuple(columns)
+        
+        by_row: list[Sequence[float]] = []
+        for name, values in rows:
+            row = self.index.add(name)
+            if row == len(by_row):
+                by_row.append(values)
+            else:
+                by_row[row] = values
+        
+        n_rows = len(by_row)
+        fill = math.nan if typecode in "fd" else 0
+        self.values = array(typecode, [fill]) * (n_rows * len(self.columns))
+        for row, values in enumerate(by_row):
+            for col, value in enumerate(values[:len(self.columns)]):
+                self.values[col * n_rows + row] = value
+                
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.index), len(self.columns)
+    
+    def column(self, col: str | int) -> memoryview:
+        """zero-copy view of a column by name or position"""
+        if isinstance(col, str):
+            col = self.columns.index(col)
+        n_rows = len(self.index)
+        return memoryview(self.values)[col * n_rows:(col + 1) * n_rows]
+    
+    def row(self, name: str) -> memoryview:
+        """zero-copy strided view of a row by name"""
+        return memoryview(self.values)[self.index[name]::len(self.index)]
+    
+    def keys(self) -> list[str]:
+        return list(self.index)
+        
+    def __getitem__(self, name: str) -> memoryview:
+        return self.row(name)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.index)
+    
+    def __len__(self) -> int:
+        return len(self.index)
+
+NAME_SUFFIXES = {"JR", "SR", "II", "III", "IV"}
+
+def normalize_key(name: str) -> str:
+    """Normalize a player or team name for matching:
+    remove accents, parentheses, punctuation and suffixes like Jr., upper case.
+    e.g. "José Ramírez Jr. (W, 5-3)" -> "JOSE RAMIREZ"
+    """
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r"\(.*?\)", " ", name)
+    parts = re.sub(r"[^A-Za-z0-9 ]", " ", name).upper().split()
+    if len(parts) > 2 and parts[-1] in NAME_SUFFIXES:
+        parts.pop()
+    return " ".join(parts)
+
+def bounded_edit_distance(a: str, b: str, max_cost: int) -> int:
+    """Levenshtein distance of a and b, returns max_cost + 1 as soon as it exceeds max_cost"""
+    if abs(len(a) - len(b)) > max_cost:
+        return max_cost + 1
+    
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cur[j] = min(prev[j] + 1, cur[j-1] + 1, prev[j-1] + (a[i-1] != b[j-1]))
+        if min(cur) > max_cost:
+            return max_cost + 1
+        prev = cur
+        
+    return min(prev[-1], max_cost + 1)
+
+class NameAlignment:
+    """Result of aligning the rows of an output table to the rows of a ground table"""
+    __slots__ = ("pairs", "unmatched_ground", "unmatched_output")
+    
+    def __init__(self, pairs: list[tuple[str, str]], unmatched_ground: list[str], unmatched_output: list[str]):
+        self.pairs = pairs      # (ground name, output name)
+        self.unmatched_ground = unmatched_ground
+        self.unmatched_output = unmatched_output
+
+class NameMatcher:
+    """Index of the ground names of a game to find the row an output name refers to.
+    Names are matched by normalized key, then by first initial and last name,
+    then by last name when one of the names has no first name,
+    then by edit distance of the last names of at most a quarter of their length.
+    Names whose first initials differ are never matched.
+    """
+    
+    def __init__(self, names: Iterable[str]):
+        self.by_key: dict[str, list[str]] = {}
+        self.by_initial_last: dict[tuple[str, str], list[str]] = {}
+        self.by_last: dict[str, list[str]] = {}
+        self.keys: dict[str, str] = {}
+        
+        for name in names:
+            key = normalize_key(name)
+            self.keys[name] = key
+            self.by_key.setdefault(key, []).append(name)
+            self.by_initial_last.setdefault(self.initial_last(key), []).append(name)
+            self.by_last.setdefault(self.initial_last(key)[1], []).append(name)
+            
+    @staticmethod
+    def initial_last(key: str) -> tuple[str, str]:
+        """first initial and last name, the initial is empty for names without a first name"""
+        parts = key.split()
+        if len(parts) < 2:
+            return "", key
+        return parts[0][0], parts[-1]
+    
+    @staticmethod
+    def same_initial(a: str, b: str) -> bool:
+        """initials agree or one of the names has no first name"""
+        return a == b or not a or not b
+        
+    def align(self, names: Iterable[str]) -> NameAlignment:
+        """Align output names one to one to the ground names.
+        Each pass only considers names left unmatched by the stricter passes before it.
+        """
+        used: set[str] = set()
+        matched: dict[str, str] = {}
+        names = list(names)
+        keys = {name: normalize_key(name) for name in names}
+        
+        def take(name: str, candidates: list[str]) -> None:
+            free = [c for c in candidates if c not in used]
+            # ambiguous matches are left to the next pass
+            if len(free) == 1:
+                used.add(free[0])
+                matched[name] = free[0]
+        
+        def same_last(key: str) -> list[str]:
+            initial, last = self.initial_last(key)
+            return [ground for ground in self.by_last.get(last, [])
+                    if self.same_initial(initial, self.initial_last(self.keys[ground])[0])]
+        
+        passes = [
+            lambda key: self.by_key.get(key, []),
+            lambda key: self.by_initial_last.get(self.initial_last(key), []),
+            same_last,
+        ]
+        for candidates in passes:
+            for name in names:
+                if name not in matched:
+                    take(name, candidates(keys[name]))
+        
+        # edit distance fallback on what is left, picking the free ground name with the closest last name
+        # among the names with the same initial, so "BRAYAN BELO" still matches "B. BELLO"
+        for name in names:
+            if name in matched:
+                continue
+            initial, last = self.initial_last(keys[name])
+            max_cost = len(last) // 4
+            best, best_cost = None, max_cost + 1
+            for ground in self.keys:
+                if ground in used:
+                    continue
+                ground_initial, ground_last = self.initial_last(self.keys[ground])
+                if not self.same_initial(initial, ground_initial):
+                    continue
+                cost = bounded_edit_distance(last, ground_last, min(max_cost, best_cost - 1))
+                if cost < best_cost:
+                    best, best_cost = ground, cost
+            if best is not None:
+                used.add(best)
+                matched[name] = best
+        
+        return NameAlignment(
+            [(ground, name) for name, ground in matched.items()],
+            [ground for ground in self.keys if ground not in used],
+            [name for name in names if name not in matched],
+        )
+
+TOTAL_ROW = re.compile(r"(team\s+)?totals?|team", re.IGNORECASE)
+
+def is_total_row(name: str) -> bool:
+    """rows like `| **Total** | ... |` or `| Team Totals | ... |` that models add below the players"""
+    return TOTAL_ROW.fullmatch(re.sub(r"[*_:]", "", name).strip()) is not None
+
+def align_rows(ground: StatTable, output: StatTable) -> NameAlignment:
+    return NameMatcher(ground).align(output)
+
+def aligned_cells(ground: StatTable, output: StatTable, alignment: NameAlignment,
+                  columns: Sequence[str] | None = None) -> Iterator[tuple[float, float]]:
+    """Yields (ground, output) value pairs of aligned rows, column by column.
+    Unmatched rows and columns missing from the output are penalized by comparing their values against 0,
+    missing (NaN) cells are skipped. Columns missing from the ground only count their non-zero output cells,
+    so padding the output with zero columns does not add correct cells.
+
+    Args:
+        columns (Sequence[str] | None): names of the columns to compare, all columns of both tables by default
+    """
+    if columns is None:
+        columns = list(ground.columns) + [col for col in output.columns if col not in ground.columns]
+        
+    pairs = [(ground.index[g], output.index[o]) for g, o in alignment.pairs]
+    unmatched_ground = [ground.index[name] for name in alignment.unmatched_ground]
+    # rows the model made up
+    unmatched_output = [output.index[name] for name in alignment.unmatched_output]
+    
+    for col in columns:
+        # contiguous column views, a column missing from a table reads as 0
+        ground_col = ground.column(col) if col in ground.columns else None
+        output_col = output.column(col) if col in output.columns else None
+        
+        for g, o in pairs:
+            y = ground_col[g] if ground_col is not None else 0
+            y_bar = output_col[o] if output_col is not None else 0
+            if ground_col is None and y_bar == 0:
+                continue
+            if not (math.isnan(y) or math.isnan(y_bar)):
+                yield y, y_bar
+        if ground_col is not None:
+            for g in unmatched_ground:
+                if not math.isnan(ground_col[g]):
+                    yield ground_col[g], 0
+        if output_col is not None:
+            for o in unmatched_output:
+                if not math.isnan(output_col[o]):
+                    yield 0, output_col[o]
+
+def score_cells(cells: Iterable[tuple[float, float]]) -> tuple[float, int, int]:
+    """sum of squared errors, number of correct cells and number of cells"""
+    sum_squared_error = 0
+    correct = 0
+    count = 0
+    for y, y_bar in cells:
+        sum_squared_error += (y - y_bar) ** 2
+        correct += y == y_bar
+        count += 1
+    return sum_squared_error, correct, count
+
+class TableParseError(ValueError):
+    """Raised when a table can not be parsed, `category` is one of the failure categories below
+    and `source` is "ground" or "output" once known.
+    """
+    MISSING_TABLE = "missing table"
+    MISSING_HEADER = "missing header"
+    COLUMN_COUNT = "wrong column count"
+    NON_NUMERIC = "non-numeric cell"
+    NO_ROWS = "no rows"
+    
+    def __init__(self, category: str, message: str, source: str = ""):
+        # all arguments go to args so the exception can be pickled, e.g. back from a process pool
+        super().__init__(category, message, source)
+        
+    @property
+    def category(self) -> str:
+        return self.args[0]
+    
+    @property
+    def message(self) -> str:
+        return self.args[1]
+    
+    @property
+    def source(self) -> str:
+        return self.args[2]
+    
+    @source.setter
+    def source(self, source: str):
+        self.args = (self.category, self.message, source)
+        
+    def __str__(self) -> str:
+        prefix = f"{self.source} " if self.source else ""
+        return f"{prefix}{self.category}: {self.message}"
 
 class TableInterface(ABC):
+    __slots__ = ()
+    
+    def parse(self, table: str, source: str) -> StatTable:
+        """parse_table with the failure tagged by the table it came from
+
+        Raises:
+            TableParseError: if the table is not a string or can not be parsed
+        """
+        if not isinstance(table, str):
+            raise TableParseError(TableParseError.MISSING_TABLE, f"expected table text, got {type(table).__name__}")
+        try:
+            return self.parse_table(table)
+        except TableParseError as e:
+            e.source = source
+            raise
+    
+    def cell_score(self, columns: tuple[str, ...] | None = None) -> tuple[float, int, int]:
+        """score_cells of the aligned cells of the columns (all by default),
+        computed once and shared by eval_rmse and eval_acc
+        """
+        if columns not in self.scores:
+            self.scores[columns] = score_cells(aligned_cells(self.ground, self.output, self.alignment, columns))
+        return self.scores[columns]
+    
     @abstractmethod
     def parse_table(self, table:str):
         pass
@@ -16,48 +374,64 @@ class TableInterface(ABC):
         pass
 
 class LineScore(TableInterface):
+    __slots__ = ("ground", "output", "alignment", "scores")
+    
+    TOTALS = ("R", "H", "E")
 
     def __init__(self, ground_table: str, output_table: str):
         super().__init__()
-        self.ground = self.parse_table(ground_table)
-        self.output = self.parse_table(output_table)
+        self.ground = self.parse(ground_table, "ground")
+        self.output = self.parse(output_table, "output")
+        self.alignment = align_rows(self.ground, self.output)
+        self.scores: dict[tuple[str, ...] | None, tuple[float, int, int]] = {}
     
-    def parse_table(self, s:str)->list[dict[str,int]]:
-        """Parse table into list of dictionary with team name as key and scored runs as value.
-        Size of list is 9 innings. 
+    def parse_table(self, s:str)->StatTable:
+        """Parse table into a table with team names as rows and scored runs of each inning as columns,
+        followed by the R, H and E totals if the table has them.
+        Games can have any number of innings, e.g. extra innings or games ended early.
 
         Args:
             s (str): the ground table or the output table of a model
         """
         s = s.strip()
         # remove unwanted output texts before the table
-        prefix = re.match(r"^(.*?)\|",s,re.DOTALL).group(1)
-        s = s[len(prefix):]
+        prefix = re.match(r"^(.*?)\|",s,re.DOTALL)
+        if prefix is None:
+            raise TableParseError(TableParseError.MISSING_TABLE, "no '|' found in text")
+        s = s[len(prefix.group(1)):]
         
-        rest_s = self.parse_innings(s)
+        columns, rest_s = self.parse_innings(s)
         team1, rest_s = self.parse_team(rest_s)
-        team1_runs, rest_s = self.parse_runs(rest_s)
+        team1_runs, rest_s = self.parse_runs(rest_s, columns)
         team2, rest_s = self.parse_team(rest_s)
-        team2_runs, rest_s = self.parse_runs(rest_s)
-        
-        line_score = []
-        for i in range(9):
-            runs = {}
-            runs[team1] = team1_runs[i]
-            runs[team2] = team2_runs[i]
-            line_score.append(runs)
-            
-        return line_score
+        team2_runs, rest_s = self.parse_runs(rest_s, columns)
+        
+        return StatTable(columns, [(team1, team1_runs), (team2, team2_runs)], typecode="h")
 
-    def parse_innings(self, s:str)->str:
-        header = r"\s*\|\s*Team.*\s*\|\s*1\s*\|\s*2\s*\|\s*3\s*\|\s*4\s*\|\s*5\s*\|\s*6\s*\|\s*7\s*\|\s*8\s*\|\s*9\s*\|"
-        rest_s = re.sub(header,'',s,count=1)
+    def parse_innings(self, s:str)->tuple[tuple[str,...], str]:
+        """parse the header `| Team | 1 | 2 | ... | n | R | H | E |`,
+        any total columns after the innings are kept, e.g. only R and H, or R, H, E and LOB
+        
+        Returns:
+            tuple[tuple[str,...], str]: column names after Team, the rest of the string after the divider
+        """
+        header = r"\|\s*Team[^|\n]*\|((?:[^|\n]*\|)+)"
+        matched = re.search(header,s)
+        columns = tuple(col.strip() for col in matched.group(1).split("|")[:-1]) if matched else ()
+        
+        n_innings = 0
+        while n_innings < len(columns) and columns[n_innings] == str(n_innings+1):
+            n_innings += 1
+        totals = columns[n_innings:]
+        if n_innings == 0 or any(col == "" or col.isdigit() for col in totals):
+            raise TableParseError(TableParseError.MISSING_HEADER, "no `| Team | 1 | ... | n | R | H | E |` header")
+        rest_s = s[matched.end():]
         
         # remove everything before divider
         divider = r".*?\|(\s*-+\s*\|)+"
         rest_s = re.sub(divider,'',rest_s,count=1)
         
-        return rest_s
+        return columns, rest_s
 
     def parse_team(self, s:str)->tuple[str,str]:
         """return the team name and the rest of the string
@@ -66,72 +440,109 @@ class LineScore(TableInterface):
             tuple[str,str]: team name, rest of the string
         """
         team_re = r".*?\|\s*([A-Z]+)\s*\|"
-        team_name = re.search(team_re,s).group(1)
+        matched = re.search(team_re,s)
+        if matched is None:
+            raise TableParseError(TableParseError.COLUMN_COUNT, "expected a row for each of the 2 teams")
+        team_name = matched.group(1)
         
-        return team_name, re.sub(team_re,'',s,count=1)
+        return team_name, s[matched.end():]
         
-    def parse_runs(self, s:str)->tuple[list[str], str]:
-        """parse string a list of runs
+    def parse_runs(self, s:str, columns: tuple[str,...])->tuple[list[int], str]:
+        """parse string a list of runs of each column,
+        innings that were not played ('-', 'X' or empty) are 0
         
         Returns:
             list[list,str]: scored runs and the rest of the string
         """
-        run_re = r"\s*([0-9]+)\s*\|"
+        run_re = r"[ \t]*([0-9]+)[ \t]*\|"
+        not_played_re = r"[ \t]*[-xX]?[ \t]*\|"
         
         runs = []
         # append runs scored in each inning and remove it from string
-        for i in range(9):
+        for i in range(len(columns)):
             matched = re.match(run_re,s)
+            if matched is not None:
+                runs.append(int(matched.group(1)))
+                s = s[matched.end():]
+                continue
+            
             # matched " - |"
-            if matched == None:
-                runs.append(0)
-                s = re.sub(r"\s*-\s*\|",'',s,count=1)
-            else:
-                runs.append(eval(matched.group(1)))
-                s = re.sub(run_re,'',s,count=1)
+            matched = re.match(not_played_re,s)
+            if matched is None:
+                if re.match(r"[ \t]*(\n|$)",s):
+                    raise TableParseError(TableParseError.COLUMN_COUNT, f"row ended after {i} of {len(columns)} columns")
+                cell = s.split("|",1)[0].strip()
+                raise TableParseError(TableParseError.NON_NUMERIC, f"column {columns[i]} is '{cell}'")
+            runs.append(0)
+            s = s[matched.end():]
         
         return runs, s
+    
+    def innings(self) -> tuple[str, ...]:
+        """inning columns of the ground and the output, innings missing from the output are scored against 0,
+        innings missing from the ground only count where the output has runs
+        """
+        innings = {col for col in self.ground.columns + self.output.columns if col.isdigit()}
+        return tuple(sorted(innings, key=int))
+    
+    def totals(self) -> tuple[str, ...]:
+        """R, H and E columns of the ground, totals missing from the output are scored against 0
+        and other columns like LOB are ignored
+        """
+        return tuple(col for col in self.TOTALS if col in self.ground.columns)
 
     def eval_rmse(self) -> float:
-        sum = 0
-        for i in range(9):
-            for team in self.ground[i]:
-                y_bar = self.output[i][team]
-                y = self.ground[i][team]
-                
-                sum += pow(y-y_bar,2)
-                
-        rsme = math.sqrt(sum / 18)
+        # 2 cells per inning unless team names could not be aligned
+        sum, _, count = self.cell_score(self.innings())
+        rsme = math.sqrt(sum / count)
         return rsme
     
     def eval_acc(self) -> float:
-        correct = 0
-        for i in range(9):
-            for team in self.ground[i]:
-                y_bar = self.output[i][team]
-                y = self.ground[i][team]
-                
-                if y_bar == y:
-                    correct += 1
-                    
-        return correct/18   # out of 18 cells
+        _, correct, total = self.cell_score(self.innings())
+        return correct/total
+    
+    def eval_totals_rmse(self) -> float | None:
+        """RMSE of the R, H and E totals, None if the ground has no totals"""
+        if not self.totals():
+            return None
+        sum, _, count = self.cell_score(self.totals())
+        return math.sqrt(sum / count)
+    
+    def eval_totals_acc(self) -> float | None:
+        """accuracy of the R, H and E totals, None if the ground has no totals"""
+        if not self.totals():
+            return None
+        _, correct, total = self.cell_score(self.totals())
+        return correct/total
     
 class PitcherBoxscore(TableInterface):
+    __slots__ = ("ground", "output", "alignment", "scores")
+    
+    STATS = ("IP", "H", "R", "BB", "K", "HR")
     
     def __init__(self, ground_table: str, output_table: str):
         super().__init__()
-        self.ground = self.parse_table(ground_table)
-        self.output = self.parse_table(output_table)
+        self.ground = self.parse(ground_table, "ground")
+        self.output = self.parse(output_table, "output")
+        self.alignment = align_rows(self.ground, self.output)
+        self.scores: dict[tuple[str, ...] | None, tuple[float, int, int]] = {}
         
-    def parse_table(self, s:str)->list[dict[str,int]]:
+    def parse_table(self, s:str)->StatTable:
         s = s.strip()
         
         # remove unwanted output texts before the table
-        prefix = re.match(r"^(.*?)\|",s,re.DOTALL).group(1)
-        s = s[len(prefix):]
+        prefix = re.match(r"^(.*?)\|",s,re.DOTALL)
+        if prefix is None:
+            raise TableParseError(TableParseError.MISSING_TABLE, "no '|' found in text")
+        s = s[len(prefix.group(1)):]
         
-        s = self.parse_header(s)
-        pitcher_stats = self.parse_pitcher_stats(s)
+        rest_s = self.parse_header(s)
+        try:
+            pitcher_stats = self.parse_pitcher_stats(rest_s)
+        except TableParseError:
+            if rest_s == s:
+                raise TableParseError(TableParseError.MISSING_HEADER, "no pitcher rows and no `| Pitcher | IP | ... | HR |` header")
+            raise
             
         return pitcher_stats
     
@@ -142,62 +553,59 @@ class PitcherBoxscore(TableInterface):
         
         return re.sub(header,'',s,count=1)
     
-    def parse_pitcher_stats(self, s: str) -> dict[str, list[int]]:
-        pitcher_pattern = r"\b((?:[A-Z]\.)+\s[A-Za-z]+)+\b"
-        pitchers = re.findall(pitcher_pattern,s)
+    def parse_pitcher_stats(self, s: str) -> StatTable:
+        """parse rows of `| Pitcher | IP | H | R | BB | K | HR |`,
+        rows without a name followed by 6 numeric stats and total rows are skipped
         
-        # get all stats
-        stats_pattern = r".*?\s*([0-9]+\.*[0-9]*)\s*\|"
-        stats = re.findall(stats_pattern,s)
+        Raises:
+            TableParseError: if no row has a name and 6 numeric stats
+        """
+        pitcher_stats = []
+        skipped = None
+        for line in s.splitlines():
+            columns = [col.strip() for col in line.strip().strip('|').split('|')]
+            if not re.search(r"[A-Za-z]", columns[0]) or is_total_row(columns[0]):
+                continue
+            if len(columns) < 7:
+                skipped = skipped or TableParseError(TableParseError.COLUMN_COUNT, f"expected 7 columns, got {len(columns)}: {line.strip()}")
+                continue
+            
+            try:
+                stats = [float(value) for value in columns[1:7]]
+            except ValueError:
+                skipped = TableParseError(TableParseError.NON_NUMERIC, f"non-numeric stats: {line.strip()}")
+                continue
+            
+            # pitcher names are converted to upper case for consistency
+            pitcher_stats.append((columns[0].upper(), stats))
         
-        pitcher_stats = {}
-        # list stats for each pitcher
-        # pitcher names are converted to upper case for consistency
-        for p in range(len(pitchers)):
-            pitcher_stats[pitchers[p].upper()] = [float(stats[i+p*6]) for i in range(6)]
+        if not pitcher_stats:
+            raise skipped or TableParseError(TableParseError.NO_ROWS, "no pitcher rows")
             
-        return pitcher_stats
+        return StatTable(self.STATS, pitcher_stats)
     
     def eval_rmse(self) -> float:
-        sum = 0
-        
-        for pitcher in self.ground:
-            for i in range(len(self.ground[pitcher])):
-                y = self.ground[pitcher][i]
-                y_bar = self.output[pitcher][i]
-                
-                sum += pow(y-y_bar,2)
-        
-        rsme = math.sqrt(sum / 18)
+        sum, _, count = self.cell_score()
+        rsme = math.sqrt(sum / count)
         return rsme
     
     def eval_acc(self) -> float:
-        correct = 0
-        total = len(self.ground.keys()) * 6     # 6 stats for each pitcher
-        
-        for pitcher in self.ground:
-            for i in range(len(self.ground[pitcher])):
-                y = self.ground[pitcher][i]
-                y_bar = self.output[pitcher][i]
-                
-                if y_bar == y:
-                    correct += 1
-                    
+        # 6 stats for each pitcher, including unmatched ones
+        _, correct, total = self.cell_score()
         return correct/total
+    
 class BatterBoxscore(TableInterface):
+    __slots__ = ("ground", "output", "alignment", "scores")
+    
+    STATS = ("AB", "R", "H", "RBI", "HR", "BB", "K", "AVG", "OBP", "SLG")
 
     def __init__(self, ground_table: str, output_table: str):
         super().__init__()
-        self.ground = self.parse_table(ground_table, source="ground")
-        self.output = self.parse_table(output_table, source="output")
-
-    def normalize_name(self, name: str) -> str:
-        """Normalize player name to 'F. LASTNAME' format."""
-        parts = name.strip().split()
-        if len(parts) == 1:
-            return parts[0].upper()
-        else:
-            return f"{parts[0][0].upper()}. {parts[-1].upper()}"
+        self.ground = self.parse(ground_table, "ground")
+        self.output = self.parse(output_table, "output")
+        # names like "Aaron Judge" and "A. Judge" are matched by NameMatcher
+        self.alignment = align_rows(self.ground, self.output)
+        self.scores: dict[tuple[str, ...] | None, tuple[float, int, int]] = {}
 
     def remove_header(self, s: str) -> str:
         header_pattern = (
@@ -206,78 +614,58 @@ class BatterBoxscore(TableInterface):
         )
         return re.sub(header_pattern, '', s, count=1).strip()
 
-    def parse_table(self, s: str, source: str = "") -> dict[str, list[float]]:
-        s = self.remove_header(s)
-        stats_by_player = {}
+    def parse_table(self, s: str) -> StatTable:
+        if '|' not in s:
+            raise TableParseError(TableParseError.MISSING_TABLE, "no '|' found in text")
+        
+        rest_s = self.remove_header(s)
+        has_header = rest_s != s.strip()
+        s = rest_s
+        stats_by_player = []
+        skipped = None
 
         for line in s.splitlines():
-            if not line.strip().startswith('|'):
+            line = line.strip()
+            if not line.startswith('|'):
                 continue
 
-            columns = [col.strip() for col in line.strip('|').split('|') if col.strip()]
-            if len(columns) < 5:
-                # print(f"❌ Skipped (too few columns): {line}")
+            # keep empty cells so every value stays in its column
+            columns = [col.strip() for col in line[1:].removesuffix('|').split('|')]
+            player = columns[1] if len(columns) > 1 else ""
+            if not re.search(r"[A-Za-z]", player) or is_total_row(player):
+                # divider, row without a player or total row
+                continue
+            if len(columns) != 3 + len(self.STATS):
+                skipped = skipped or TableParseError(TableParseError.COLUMN_COUNT, f"expected {3 + len(self.STATS)} columns, got {len(columns)}: {line}")
                 continue
 
             # Extract player name and numeric stats
             team_or_abbrev = columns[0]
-            player_name = self.normalize_name(columns[1])
+            player_name = columns[1].upper()
 
             try:
-                stats = []
-                # Start from columns[3] to get numeric fields after Player and Pos
-                for value in columns[3:]:
-                    try:
-                        stats.append(float(value))
-                    except ValueError:
-                        # skip if value is not a number (e.g., empty Pos or comments)
-                        pass
-
-                if len(stats) < 5:
-                    # print(f"❌ Skipped (too few stats): {line}")
-                    continue
-
-                stats_by_player[player_name] = stats
-            except Exception as e:
-                # print(f"⚠️ Failed parsing stats: {line} ({e})")
+                # columns[3:] are the numeric fields after Team, Player and Pos,
+                # '-' or empty is a missing stat (NaN)
+                stats = [math.nan if re.fullmatch(r"-*", value) else float(value) for value in columns[3:]]
+            except ValueError:
+                skipped = TableParseError(TableParseError.NON_NUMERIC, f"non-numeric stats: {line}")
                 continue
 
-        # print(f"✅ Parsed {len(stats_by_player)} player rows ({source})")
-        return stats_by_player
-
-    def eval_rmse(self) -> float:
-        sum_squared_error = 0
-        count = 0
+            stats_by_player.append((player_name, stats))
 
-        for player in self.ground:
-            if player not in self.output:
-                # print(f"❌ Missing prediction for {player}")
-                continue
-
-            min_len = min(len(self.ground[player]), len(self.output[player]))
-            for i in range(min_len):
-                y = self.ground[player][i]
-                y_bar = self.output[player][i]
-                sum_squared_error += (y - y_bar) ** 2
-                count += 1
+        if not stats_by_player:
+            if not has_header:
+                raise TableParseError(TableParseError.MISSING_HEADER, "no player rows and no `| Team | Player | ... | SLG |` header")
+            raise skipped or TableParseError(TableParseError.NO_ROWS, "no player rows")
+        
+        return StatTable(self.STATS, stats_by_player)
 
+    def eval_rmse(self) -> float:
+        # missing stats are skipped, unmatched players are penalized
+        sum_squared_error, _, count = self.cell_score()
         return math.sqrt(sum_squared_error / count) if count > 0 else -1
 
     def eval_acc(self) -> float:
-        correct = 0
-        total = 0
-
-        for player in self.ground:
-            if player not in self.output:
-                continue
-
-            min_len = min(len(self.ground[player]), len(self.output[player]))
-            for i in range(min_len):
-                y = self.ground[player][i]
-                y_bar = self.output[player][i]
-                if y == y_bar:
-                    correct += 1
-                total += 1
-
+        _, correct, total = self.cell_score()
         return correct / total if total > 0 else -1
 